@@ -1,7 +1,11 @@
+import csv
+import os
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from features.smart_assistant import smart_assistant
+from features.analytics import scoring
 import plotly.express as px
 from features.data_management import data_management
 
@@ -18,138 +22,187 @@ BUDGETS_FILE = "database/budgets.txt"
 # --- Categories ---
 EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
 INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "Other"]
+TRANSACTION_TYPES = ["income", "expense"]
 
 # --- Transaction Functions ---
 
 def write_transaction(date, type, category, description, amount):
     """Writes a new transaction to the text file."""
-    with open(TRANSACTIONS_FILE, "a") as f:
-        f.write(f"{date},{type},{category},{description},{int(amount * 100)}\n")
-
-def write_budgets(budgets):
-    """Writes all budgets to the file, overwriting it."""
-    with open(BUDGETS_FILE, "w") as f:
-        for category, amount in budgets.items():
-            f.write(f"{category},{int(amount * 100)}\n")
+    write_transactions_bulk([(date, type, category, description, amount)])
+
+def write_transactions_bulk(records):
+    """Appends many (date, type, category, description, amount) transactions with a single open."""
+    with open(TRANSACTIONS_FILE, "a", newline="") as f:
+        csv.writer(f, lineterminator="\n").writerows(
+            (date, type, category, description, round(amount * 100))
+            for date, type, category, description, amount in records
+        )
+    load_transactions.clear()
+    _month_slice.clear()
+    compute_monthly_aggs.clear()
+
+def write_budget_entry(category, amount_cents):
+    """Appends a single budget to the file; later entries for a category override earlier ones."""
+    with open(BUDGETS_FILE, "a") as f:
+        f.write(f"{category},{amount_cents}\n")
+
+    # Compact once superseded entries outnumber the live ones, so the rewrite is amortized over many appends
+    budgets, line_count = _read_budgets_file()
+    if line_count - len(budgets) > len(budgets):
+        _overwrite_budgets_file(budgets)
+    load_budgets.clear()
+
+def _overwrite_budgets_file(budgets):
+    tmp_path = BUDGETS_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write("".join(f"{category},{amount_cents}\n" for category, amount_cents in budgets.items()))
+    os.replace(tmp_path, BUDGETS_FILE)
 
 # --- Helper Functions ---
 
-def load_transactions():
-    """Loads transactions from the text file into a DataFrame, handling commas in description."""
-    transactions = []
+def _file_mtime(path):
+    """Returns the modification time of a file, or 0 if it doesn't exist yet."""
     try:
-        with open(TRANSACTIONS_FILE, "r") as f:
-            for line in f:
-                if line.strip():
-                    parts = line.strip().split(',')
-                    if len(parts) >= 5:
-                        date = parts[0]
-                        trans_type = parts[1]
-                        category = parts[2]
-                        amount = parts[-1]
-                        description = ",".join(parts[3:-1])
-                        
-                        try:
-                            transactions.append([date, trans_type, category, description, int(amount)])
-                        except ValueError:
-                            # Handle cases where amount is not a valid integer
-                            pass
-    
-        if not transactions:
-            return pd.DataFrame(columns=['date', 'type', 'category', 'description', 'amount'])
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+@st.cache_data(show_spinner=False)
+def load_transactions(mtime=None):
+    """Loads transactions from the text file into a DataFrame using the C CSV parser."""
+    # `mtime` is only part of the cache key, so writes to the file invalidate the cached frame.
+    columns = ['date', 'type', 'category', 'description', 'amount_cents']
+    try:
+        df = pd.read_csv(
+            TRANSACTIONS_FILE,
+            names=columns,
+            header=None,
+            dtype={'description': str},
+            keep_default_na=False,
+            skip_blank_lines=True,
+            on_bad_lines='skip',
+            engine='c',
+        )
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return pd.DataFrame(columns=columns)
+
+    # Drop rows where amount is not a valid integer
+    df['amount_cents'] = pd.to_numeric(df['amount_cents'], errors='coerce')
+    df = df.dropna(subset=['amount_cents'])
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
+    df['amount_cents'] = df['amount_cents'].astype('int64')  # Kept in cents; convert only for display
+    df['type'] = _as_categorical(df['type'], TRANSACTION_TYPES)
+    df['category'] = _as_categorical(df['category'], EXPENSE_CATEGORIES + INCOME_CATEGORIES)
+    return df
+
+
+def _as_categorical(values, known_categories):
+    """Converts a string column to a categorical dtype, keeping any values outside the known list."""
+    categories = list(dict.fromkeys(known_categories))
+    categories += sorted(set(values.unique()) - set(categories))
+    return values.astype(pd.CategoricalDtype(categories=categories))
 
-        df = pd.DataFrame(transactions, columns=['date', 'type', 'category', 'description', 'amount'])
-        df['date'] = pd.to_datetime(df['date']).dt.date
-        df['amount'] = df['amount'] / 100  # Convert cents to dollars
-        return df
-        
-    except FileNotFoundError:
-        return pd.DataFrame(columns=['date', 'type', 'category', 'description', 'amount'])
 
+@st.cache_data(show_spinner=False)
+def load_budgets(mtime=None):
+    """Loads budgets (in cents) from the text file into a dictionary."""
+    # `mtime` is only part of the cache key, so writes to the file invalidate the cached dict.
+    return _read_budgets_file()[0]
 
-def load_budgets():
-    """Loads budgets from the text file into a dictionary."""
+def _read_budgets_file():
+    """Reads the budgets file, returning the budgets (last entry per category wins) and its number of lines."""
     budgets = {}
     try:
         with open(BUDGETS_FILE, "r") as f:
-            for line in f:
-                if line.strip():
-                    parts = line.strip().split(',')
-                    if len(parts) == 2:
-                        category = parts[0]
-                        try:
-                            budgets[category] = int(parts[1]) / 100
-                        except ValueError:
-                            pass # Ignore malformed budget lines
+            lines = [line for line in f.read().splitlines() if line.strip()]
     except FileNotFoundError:
-        pass
-    return budgets
-
-def _calculate_savings_rate_score(total_income, total_expenses):
-    """Calculates the savings rate score (max 40)."""
-    if total_income == 0:
-        return 0
-    savings_rate = ((total_income - total_expenses) / total_income) * 100
-    if savings_rate >= 20:
-        return 40
-    elif savings_rate >= 10:
-        return 30
-    elif savings_rate >= 0:
-        return 20
-    else:
-        return 0
-
-def _calculate_budget_adherence_score(monthly_transactions, budgets):
-    """Calculates the budget adherence score (max 35)."""
+        return budgets, 0
+
+    for line in lines:
+        parts = line.strip().split(',')
+        if len(parts) == 2:
+            try:
+                budgets[parts[0]] = int(parts[1])
+            except ValueError:
+                pass # Ignore malformed budget lines
+    return budgets, len(lines)
+
+def _to_euros(amounts_cents):
+    """Converts a Series of amounts in cents to euros for display."""
+    return (amounts_cents / 100).rename('amount')
+
+def _month_mask(dates, when):
+    """Returns a boolean mask that is True for dates in the same month as `when`."""
+    month_start = pd.Timestamp(when.year, when.month, 1)
+    next_month_start = month_start + pd.offsets.MonthBegin(1)
+    return (dates >= month_start) & (dates < next_month_start)
+
+@st.cache_data(show_spinner=False)
+def _month_slice(mtime, year, month):
+    """Returns the transactions that fall within the given month."""
+    transactions_df = load_transactions(mtime)
+    if transactions_df.empty:
+        return transactions_df
+    return transactions_df[_month_mask(transactions_df['date'], datetime(year, month, 1))]
+
+@st.cache_data(show_spinner=False)
+def compute_monthly_aggs(mtime, year, month):
+    """Aggregates one month of transactions by category, with income and expense totals."""
+    # Like load_transactions, `mtime` is only part of the cache key.
+    empty_totals = pd.Series(dtype='int64', name='amount_cents')
+    aggs = {
+        'expenses_by_cat': empty_totals,
+        'income_by_cat': empty_totals,
+        'total_income': 0,
+        'total_expenses': 0,
+    }
+
+    monthly_transactions_df = _month_slice(mtime, year, month)
+    if monthly_transactions_df.empty:
+        return aggs
+
+    # Aggregate the month by type and category in a single pass
+    monthly_totals = monthly_transactions_df.groupby(['type', 'category'], observed=True)['amount_cents'].sum()
+    # Categories are sorted by name, as a plain string groupby would, rather than in the categorical dtype's order
+    totals_by_type = {
+        trans_type: totals.droplevel('type').sort_index(key=lambda categories: categories.astype(str))
+        for trans_type, totals in monthly_totals.groupby(level='type', observed=True)
+    }
+
+    aggs['expenses_by_cat'] = totals_by_type.get('expense', empty_totals)
+    aggs['income_by_cat'] = totals_by_type.get('income', empty_totals)
+    aggs['total_income'] = aggs['income_by_cat'].sum()
+    aggs['total_expenses'] = aggs['expenses_by_cat'].sum()
+    return aggs
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def spending_pie_chart(mtime, year, month):
+    """Builds the spending by category pie chart for a month, reused across reruns."""
+    spending_by_category = compute_monthly_aggs(mtime, year, month)['expenses_by_cat']
+    return px.pie(_to_euros(spending_by_category), values='amount', names=spending_by_category.index, title='Spending by Category')
+
+def _calculate_budget_adherence_score(spending_by_category, budgets):
+    """Calculates the budget adherence score (max 35) from this month's spending per category."""
     if not budgets:
         return 0
-    
-    total_budget_utilized = 0
-    num_budgeted_categories = 0
-    
-    for category, budget_amount in budgets.items():
-        spent = sum(
-            t['amount'] for t in monthly_transactions 
-            if t['type'] == 'expense' and t['category'] == category
-        )
-        if budget_amount > 0:
-            utilization = (spent / budget_amount) * 100
-            total_budget_utilized += min(utilization, 100)
-            num_budgeted_categories += 1
 
-    if num_budgeted_categories == 0:
-        return 35
+    budget_amounts = pd.Series(budgets, dtype=float)
+    budget_amounts = budget_amounts[budget_amounts > 0]
 
-    avg_utilization = total_budget_utilized / num_budgeted_categories
-    
-    if avg_utilization <= 80:
+    if budget_amounts.empty:
         return 35
-    elif avg_utilization <= 90:
-        return 25
-    elif avg_utilization <= 100:
-        return 15
-    else:
-        return 5
-
-def _calculate_income_expense_score(total_income, total_expenses):
-    """Calculates the income vs. expense score (max 25)."""
-    if total_income == 0:
-        return 0
-    if total_income > total_expenses:
-        return 25
-    elif total_income * 0.9 < total_expenses:
-        return 10
-    else:
-        return 0
+
+    spent = spending_by_category.reindex(budget_amounts.index, fill_value=0).to_numpy()
+    utilization = np.minimum(spent / budget_amounts.to_numpy() * 100, 100)
+    avg_utilization = utilization.mean()
+    return scoring.budget_adherence_score(avg_utilization)
 
 def _interpret_score(score):
     """Prints an interpretation of the financial health score."""
-    if score >= 75:
-        return "Excellent! Your finances are in great shape. Keep up the good work!"
-    elif score >= 50:
-        return "Good. There's room for improvement, but you're on the right track."
-    else:
-        return "Needs Attention. Your finances require careful review. Focus on budgeting and saving."
+    return scoring.HEALTH_MESSAGES[scoring.health_level(score)]
 
 # --- Main Dashboard ---
 
@@ -195,35 +248,36 @@ def main():
     """, unsafe_allow_html=True)
 
     st.sidebar.title("Navigation")
-    selection = st.sidebar.radio("Go to", ["Dashboard", "Add Income", "Add Expense", "Set Budget", "Smart Assistant", "Analytics"])
+    selection = st.sidebar.radio("Go to", ["Dashboard", "Add Income", "Add Expense", "Set Budget", "Smart Assistant", "Analytics", "Data Management"])
 
     if selection == "Dashboard":
         st.title("Faj Financial Dashboard")
 
         # --- Load Data ---
-        transactions_df = load_transactions()
-        budgets = load_budgets()
+        transactions_df = load_transactions(_file_mtime(TRANSACTIONS_FILE))
+        budgets = load_budgets(_file_mtime(BUDGETS_FILE))
 
         # --- Balance Section ---
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.subheader("Current Financial Overview")
 
         if not transactions_df.empty:
-            total_income = transactions_df[transactions_df['type'] == 'income']['amount'].sum()
-            total_expenses = transactions_df[transactions_df['type'] == 'expense']['amount'].sum()
+            totals_by_type = transactions_df.groupby('type', observed=True)['amount_cents'].sum()
+            total_income = totals_by_type.get('income', 0)
+            total_expenses = totals_by_type.get('expense', 0)
             current_balance = total_income - total_expenses
 
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.markdown('<p class="metric-label">Total Income</p>', unsafe_allow_html=True)
-                st.markdown(f'<p class="metric-value income">€{total_income:,.2f}</p>', unsafe_allow_html=True)
+                st.markdown(f'<p class="metric-value income">€{total_income / 100:,.2f}</p>', unsafe_allow_html=True)
             with col2:
                 st.markdown('<p class="metric-label">Total Expenses</p>', unsafe_allow_html=True)
-                st.markdown(f'<p class="metric-value expense">€{total_expenses:,.2f}</p>', unsafe_allow_html=True)
+                st.markdown(f'<p class="metric-value expense">€{total_expenses / 100:,.2f}</p>', unsafe_allow_html=True)
             with col3:
                 st.markdown('<p class="metric-label">Current Balance</p>', unsafe_allow_html=True)
                 balance_color_class = "income" if current_balance >= 0 else "expense"
-                st.markdown(f'<p class="metric-value {balance_color_class}">€{current_balance:,.2f}</p>', unsafe_allow_html=True)
+                st.markdown(f'<p class="metric-value {balance_color_class}">€{current_balance / 100:,.2f}</p>', unsafe_allow_html=True)
         else:
             st.info("No transaction data available.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -234,35 +288,28 @@ def main():
 
         if budgets and not transactions_df.empty:
             now = datetime.now()
-            # Ensure 'date' column is datetime
-            transactions_df['date'] = pd.to_datetime(transactions_df['date'])
-            
-            current_month_expenses = transactions_df[
-                (transactions_df['type'] == 'expense') &
-                (transactions_df['date'].dt.month == now.month) &
-                (transactions_df['date'].dt.year == now.year)
-            ]
-            
-            spending_by_category = current_month_expenses.groupby('category')['amount'].sum()
-
-            for category, budget_amount in budgets.items():
-                spent_amount = spending_by_category.get(category, 0)
-                percentage = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
-
+            monthly_aggs = compute_monthly_aggs(_file_mtime(TRANSACTIONS_FILE), now.year, now.month)
+            spending_by_category = monthly_aggs['expenses_by_cat']
+
+            # Work out utilization and status color for every budget in one vectorized pass
+            budget_amounts = pd.Series(budgets, dtype=float)
+            spent_amounts = spending_by_category.reindex(budget_amounts.index, fill_value=0)
+            percentages = np.divide(
+                spent_amounts.to_numpy() * 100, budget_amounts.to_numpy(),
+                out=np.zeros(len(budget_amounts)), where=budget_amounts.to_numpy() > 0
+            )
+            colors = np.select([percentages >= 100, percentages >= 70], ["red", "orange"], default="green")
+
+            for category, budget_amount, spent_amount, percentage, color in zip(
+                budget_amounts.index, budget_amounts, spent_amounts, percentages, colors
+            ):
                 st.markdown(f"**{category}**")
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    if percentage >= 100:
-                        color = "red"
-                    elif percentage >= 70:
-                        color = "orange"
-                    else:
-                        color = "green"
-                    
                     st.progress(int(min(percentage, 100)))
 
                 with col2:
-                    st.markdown(f"€{spent_amount:,.2f} / €{budget_amount:,.2f}")
+                    st.markdown(f"€{spent_amount / 100:,.2f} / €{budget_amount / 100:,.2f}")
 
         elif not budgets:
             st.info("No budgets set. Please set budgets in the CLI application.")
@@ -275,22 +322,17 @@ def main():
         st.subheader("Recent Transactions")
 
         if not transactions_df.empty:
-            # Ensure 'date' column is datetime before sorting
-            transactions_df['date'] = pd.to_datetime(transactions_df['date'])
-            recent_transactions = transactions_df.sort_values(by='date', ascending=False).head(10)
-            
-            def get_color(trans_type):
-                return "red" if trans_type == "expense" else "green"
-
-            for index, row in recent_transactions.iterrows():
+            # Partial sort for the 10 most recent; reversed so ties favour the latest entries
+            recent_transactions = transactions_df.iloc[::-1].nlargest(10, 'date')
+            recent_transactions['color'] = np.where(recent_transactions['type'].eq('expense'), 'red', 'green')
+
+            for row in recent_transactions.to_dict('records'):
                 cols = st.columns([1,1,1,2,1])
                 cols[0].write(row['date'].strftime('%Y-%m-%d'))
                 cols[1].write(row['type'].capitalize())
                 cols[2].write(row['category'])
                 cols[3].write(row['description'])
-                
-                amount_color = get_color(row['type'])
-                cols[4].markdown(f"<span style='color:{amount_color};'>€{row['amount']:,.2f}</span>", unsafe_allow_html=True)
+                cols[4].markdown(f"<span style='color:{row['color']};'>€{row['amount_cents'] / 100:,.2f}</span>", unsafe_allow_html=True)
         else:
             st.info("No transactions to display.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -335,7 +377,7 @@ def main():
 
     elif selection == "Set Budget":
         st.title("Set Monthly Budget")
-        budgets = load_budgets()
+        budgets = load_budgets(_file_mtime(BUDGETS_FILE))
         
         with st.form("budget_form"):
             category = st.selectbox("Category", EXPENSE_CATEGORIES)
@@ -346,30 +388,25 @@ def main():
                 if amount <= 0:
                     st.error("Amount must be positive.")
                 else:
-                    budgets[category] = amount
-                    write_budgets(budgets)
+                    budgets[category] = round(amount * 100)
+                    write_budget_entry(category, budgets[category])
                     st.success(f"Budget for {category} set to €{amount:,.2f}")
                     st.rerun()
 
         st.subheader("Current Budgets")
         if budgets:
-            st.table(pd.DataFrame(list(budgets.items()), columns=['Category', 'Amount']))
+            st.table(pd.DataFrame([(c, a / 100) for c, a in budgets.items()], columns=['Category', 'Amount']))
         else:
             st.info("No budgets set yet.")
 
     elif selection == "Smart Assistant":
         st.title("Smart Financial Assistant")
-        transactions_df = load_transactions()
-        budgets = load_budgets()
-        
-        # The get_recommendations function in the smart_assistant module expects amounts in cents
-        # but our load_transactions function converts them to dollars.
-        # We need to pass the amounts in cents.
-        transactions_for_assistant = transactions_df.copy()
-        transactions_for_assistant['amount'] = (transactions_for_assistant['amount'] * 100).astype(int)
+        transactions_df = load_transactions(_file_mtime(TRANSACTIONS_FILE))
+        budgets = load_budgets(_file_mtime(BUDGETS_FILE))
         
-        # The get_recommendations function expects a dict of transactions
-        transactions_list = transactions_for_assistant.to_dict('records')
+        # The get_recommendations function expects transaction records with the amount
+        # in cents as an 'amount' attribute, as the CLI's Tx namedtuples have it.
+        transactions_list = transactions_df.rename(columns={'amount_cents': 'amount'}).itertuples(index=False, name='Tx')
         
         recommendations = smart_assistant.get_recommendations(transactions_list, budgets)
         
@@ -384,132 +421,82 @@ def main():
 
     elif selection == "Analytics":
         st.title("Financial Analytics")
-        transactions_df = load_transactions()
+        transactions_df = load_transactions(_file_mtime(TRANSACTIONS_FILE))
         
-        tab1, tab2, tab3, tab4 = st.tabs(["Spending", "Income", "Savings", "Financial Health"])
+        # Only the selected analysis is computed and rendered on each rerun
+        analysis = st.radio("Analysis", ["Spending", "Income", "Savings", "Financial Health"], horizontal=True)
 
-        with tab1:
-            st.subheader("Spending Analysis")
-            if not transactions_df.empty:
-                now = datetime.now()
-                current_month_start = now.replace(day=1)
-                
-                # Ensure 'date' column is datetime
-                transactions_df['date'] = pd.to_datetime(transactions_df['date'])
+        if not transactions_df.empty:
+            now = datetime.now()
+            current_month_start = now.replace(day=1)
 
-                expenses_df = transactions_df[
-                    (transactions_df['type'] == 'expense') &
-                    (transactions_df['date'].dt.month == now.month) &
-                    (transactions_df['date'].dt.year == now.year)
-                ]
+            # Every analysis below reads from the same cached monthly aggregates
+            monthly_aggs = compute_monthly_aggs(_file_mtime(TRANSACTIONS_FILE), now.year, now.month)
+            spending_by_category = monthly_aggs['expenses_by_cat']
+            income_by_source = monthly_aggs['income_by_cat']
+            total_income = monthly_aggs['total_income']
+            total_expenses = monthly_aggs['total_expenses']
 
-                if not expenses_df.empty:
-                    spending_by_category = expenses_df.groupby('category')['amount'].sum()
-                    
+        if analysis == "Spending":
+            st.subheader("Spending Analysis")
+            if not transactions_df.empty:
+                if not spending_by_category.empty:
                     # Pie chart
-                    fig = px.pie(spending_by_category, values='amount', names=spending_by_category.index, title='Spending by Category')
+                    fig = spending_pie_chart(_file_mtime(TRANSACTIONS_FILE), now.year, now.month)
                     st.plotly_chart(fig)
 
                     # Top 3 categories
                     top_categories = spending_by_category.nlargest(3)
                     st.subheader("Top 3 Spending Categories")
-                    st.table(top_categories)
+                    st.table(_to_euros(top_categories))
 
                     # Average daily expense
                     days_in_month = (now - current_month_start).days + 1
-                    avg_daily_expense = expenses_df['amount'].sum() / days_in_month
-                    st.metric(label="Average Daily Expense", value=f"€{avg_daily_expense:,.2f}")
+                    avg_daily_expense = total_expenses / days_in_month
+                    st.metric(label="Average Daily Expense", value=f"€{avg_daily_expense / 100:,.2f}")
 
                 else:
                     st.info("No spending data for the current month.")
             else:
                 st.info("No transaction data available.")
         
-        with tab2:
+        elif analysis == "Income":
             st.subheader("Income Analysis")
             if not transactions_df.empty:
-                now = datetime.now()
-                current_month_start = now.replace(day=1)
-                
-                # Ensure 'date' column is datetime
-                transactions_df['date'] = pd.to_datetime(transactions_df['date'])
-
-                income_df = transactions_df[
-                    (transactions_df['type'] == 'income') &
-                    (transactions_df['date'].dt.month == now.month) &
-                    (transactions_df['date'].dt.year == now.year)
-                ]
-
-                if not income_df.empty:
-                    income_by_source = income_df.groupby('category')['amount'].sum()
-                    
+                if not income_by_source.empty:
                     st.subheader("Income by Source")
-                    st.table(income_by_source)
+                    st.table(_to_euros(income_by_source))
 
-                    total_income = income_df['amount'].sum()
-                    st.metric(label="Total Income this Month", value=f"€{total_income:,.2f}")
+                    st.metric(label="Total Income this Month", value=f"€{total_income / 100:,.2f}")
                 else:
                     st.info("No income data for the current month.")
             else:
                 st.info("No transaction data available.")
 
-        with tab3:
+        elif analysis == "Savings":
             st.subheader("Savings Analysis")
             if not transactions_df.empty:
-                now = datetime.now()
-                current_month_start = now.replace(day=1)
-                
-                # Ensure 'date' column is datetime
-                transactions_df['date'] = pd.to_datetime(transactions_df['date'])
-
-                monthly_transactions = transactions_df[
-                    (transactions_df['date'].dt.month == now.month) &
-                    (transactions_df['date'].dt.year == now.year)
-                ]
-                
-                total_income = monthly_transactions[monthly_transactions['type'] == 'income']['amount'].sum()
-                total_expenses = monthly_transactions[monthly_transactions['type'] == 'expense']['amount'].sum()
-
                 if total_income > 0:
                     savings = total_income - total_expenses
                     savings_rate = (savings / total_income) * 100
                     
-                    st.metric(label="Total Income this Month", value=f"€{total_income:,.2f}")
-                    st.metric(label="Total Expenses this Month", value=f"€{total_expenses:,.2f}")
-                    st.metric(label="Savings this Month", value=f"€{savings:,.2f}")
+                    st.metric(label="Total Income this Month", value=f"€{total_income / 100:,.2f}")
+                    st.metric(label="Total Expenses this Month", value=f"€{total_expenses / 100:,.2f}")
+                    st.metric(label="Savings this Month", value=f"€{savings / 100:,.2f}")
                     st.metric(label="Savings Rate", value=f"{savings_rate:.2f}%")
                 else:
                     st.info("No income data for the current month to calculate savings.")
             else:
                 st.info("No transaction data available.")
 
-        with tab4:
+        elif analysis == "Financial Health":
             st.subheader("Financial Health Score")
             if not transactions_df.empty:
-                now = datetime.now()
-                current_month_start = now.replace(day=1)
-                
-                # Ensure 'date' column is datetime
-                transactions_df['date'] = pd.to_datetime(transactions_df['date'])
-
-                monthly_transactions_df = transactions_df[
-                    (transactions_df['date'].dt.month == now.month) &
-                    (transactions_df['date'].dt.year == now.year)
-                ]
-                
-                # The _calculate_budget_adherence_score expects a list of dicts with amounts in cents
-                monthly_transactions_list = monthly_transactions_df.copy()
-                monthly_transactions_list['amount'] = (monthly_transactions_list['amount'] * 100).astype(int)
-                monthly_transactions_list = monthly_transactions_list.to_dict('records')
-
-                total_income = monthly_transactions_df[monthly_transactions_df['type'] == 'income']['amount'].sum()
-                total_expenses = monthly_transactions_df[monthly_transactions_df['type'] == 'expense']['amount'].sum()
-                
-                budgets = load_budgets()
+                budgets = load_budgets(_file_mtime(BUDGETS_FILE))
 
-                savings_rate_score = _calculate_savings_rate_score(total_income, total_expenses)
-                budget_adherence_score = _calculate_budget_adherence_score(monthly_transactions_list, budgets)
-                income_expense_score = _calculate_income_expense_score(total_income, total_expenses)
+                savings_rate_score = scoring.savings_rate_score(total_income, total_expenses)
+                budget_adherence_score = _calculate_budget_adherence_score(spending_by_category, budgets)
+                income_expense_score = scoring.income_expense_score(total_income, total_expenses)
 
                 final_score = savings_rate_score + budget_adherence_score + income_expense_score
 
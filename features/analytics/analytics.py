@@ -2,105 +2,89 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from datetime import datetime, timedelta
+from heapq import nlargest
+from operator import itemgetter
 
 # Import the helper function from the transactions module
 from features.transactions import transactions as transaction_features
 from features.budgets import budgets as budget_features
 from features.smart_assistant import smart_assistant
+from features.analytics import scoring
+# pandas, numpy and the DataFrame cache are imported inside the functions that use them,
+# so the CLI menu starts without paying pandas' import cost
 
 # Initialize Rich Console
 console = Console()
 
 # --- Core Functions ---
 
-def analyze_spending():
+def analyze_spending(transactions_df=None):
     """Analyzes spending patterns for the current month."""
     console.print("\n[bold cyan]-- Spending Analysis --[/bold cyan]")
 
-    all_transactions = transaction_features._read_transactions()
-    now = datetime.now()
-    current_month_start = now.replace(day=1)
+    from features.transactions._cache import load_df_since
 
-    # Filter for expenses in the current month
-    expenses = [
-        t for t in all_transactions 
-        if t['type'] == 'expense' and t['date'] >= current_month_start.date()
-    ]
+    month_start = datetime.now().date().replace(day=1)
+    transactions_df = load_df_since(month_start) if transactions_df is None else transactions_df
+    month = _aggregate_month(transactions_df, month_start)
+    spending_by_category = month['spend_by_cat']
 
-    if not expenses:
+    if not spending_by_category:
         console.print("[yellow]No expenses found for the current month.[/yellow]")
         return
 
     # --- Calculations ---
-    spending_by_category = {}
-    for e in expenses:
-        spending_by_category[e['category']] = spending_by_category.get(e['category'], 0) + e['amount']
-    
-    total_spent = sum(spending_by_category.values())
+    total_spent = month['total_expenses']
     
     # Top 3 categories
-    top_categories = sorted(spending_by_category.items(), key=lambda item: item[1], reverse=True)[:3]
+    top_categories = nlargest(3, spending_by_category.items(), key=itemgetter(1))
     
     # Average daily expense
-    days_in_month = (now - current_month_start).days + 1
-    avg_daily_expense = total_spent / days_in_month
+    avg_daily_expense = total_spent / month['days']
 
     # --- Display ---
     _display_pie_chart(spending_by_category, total_spent)
     
     console.print("\n[bold]Top 3 Spending Categories:[/bold]")
-    for category, amount in top_categories:
-        console.print(f"- {category}: {amount/100:.2f}")
+    console.print("\n".join(f"- {category}: {amount/100:.2f}" for category, amount in top_categories))
 
     console.print(f"\n[bold]Average Daily Expense:[/bold] {avg_daily_expense/100:.2f}")
 
-def analyze_income():
+def analyze_income(transactions_df=None):
     """Analyzes income patterns for the current month."""
     console.print("\n[bold cyan]-- Income Analysis --[/bold cyan]")
 
-    all_transactions = transaction_features._read_transactions()
-    now = datetime.now()
-    current_month_start = now.replace(day=1)
+    from features.transactions._cache import load_df_since
 
-    # Filter for income in the current month
-    income_transactions = [
-        t for t in all_transactions 
-        if t['type'] == 'income' and t['date'] >= current_month_start.date()
-    ]
+    month_start = datetime.now().date().replace(day=1)
+    transactions_df = load_df_since(month_start) if transactions_df is None else transactions_df
+    month = _aggregate_month(transactions_df, month_start)
+    income_by_source = month['income_by_src']
 
-    if not income_transactions:
+    if not income_by_source:
         console.print("[yellow]No income found for the current month.[/yellow]")
         return
 
     # --- Calculations ---
-    income_by_source = {}
-    for t in income_transactions:
-        income_by_source[t['category']] = income_by_source.get(t['category'], 0) + t['amount']
-    
-    total_income = sum(income_by_source.values())
+    total_income = month['total_income']
 
     # --- Display ---
     console.print("\n[bold]Income by Source:[/bold]")
-    for source, amount in income_by_source.items():
-        console.print(f"- {source}: {amount/100:.2f}")
+    console.print("\n".join(f"- {source}: {amount/100:.2f}" for source, amount in income_by_source.items()))
 
     console.print(f"\n[bold]Total Income this month:[/bold] [green]{total_income/100:.2f}[/green]")
 
-def analyze_savings():
+def analyze_savings(transactions_df=None):
     """Analyzes savings for the current month."""
     console.print("\n[bold cyan]-- Savings Analysis --[/bold cyan]")
 
-    all_transactions = transaction_features._read_transactions()
-    now = datetime.now()
-    current_month_start = now.replace(day=1)
-
-    # Filter for income and expenses in the current month
-    monthly_transactions = [
-        t for t in all_transactions if t['date'] >= current_month_start.date()
-    ]
+    from features.transactions._cache import load_df_since
 
-    total_income = sum(t['amount'] for t in monthly_transactions if t['type'] == 'income')
-    total_expenses = sum(t['amount'] for t in monthly_transactions if t['type'] == 'expense')
+    month_start = datetime.now().date().replace(day=1)
+    transactions_df = load_df_since(month_start) if transactions_df is None else transactions_df
+    month = _aggregate_month(transactions_df, month_start)
+    total_income = month['total_income']
+    total_expenses = month['total_expenses']
 
     if total_income == 0:
         console.print("[yellow]No income recorded for this month. Savings cannot be calculated.[/yellow]")
@@ -128,31 +112,28 @@ def analyze_savings():
     )
     console.print(panel)
 
-def financial_health_score():
+def financial_health_score(transactions_df=None, budgets=None):
     """Calculates and displays a financial health score."""
     console.print("\n[bold cyan]-- Financial Health Score --[/bold cyan]")
 
-    all_transactions = transaction_features._read_transactions()
-    budgets = budget_features._read_budgets()
-    now = datetime.now()
-    current_month_start = now.replace(day=1)
+    from features.transactions._cache import load_df_since
 
-    monthly_transactions = [
-        t for t in all_transactions if t['date'] >= current_month_start.date()
-    ]
-    
-    total_income = sum(t['amount'] for t in monthly_transactions if t['type'] == 'income')
-    total_expenses = sum(t['amount'] for t in monthly_transactions if t['type'] == 'expense')
+    month_start = datetime.now().date().replace(day=1)
+    transactions_df = load_df_since(month_start) if transactions_df is None else transactions_df
+    budgets = budget_features._read_budgets() if budgets is None else budgets
+    month = _aggregate_month(transactions_df, month_start)
+    total_income = month['total_income']
+    total_expenses = month['total_expenses']
 
     # --- Calculate individual scores ---
-    savings_rate_score = _calculate_savings_rate_score(total_income, total_expenses)
-    budget_adherence_score = _calculate_budget_adherence_score(monthly_transactions, budgets)
-    income_expense_score = _calculate_income_expense_score(total_income, total_expenses)
+    savings_rate_score = scoring.savings_rate_score(total_income, total_expenses)
+    budget_adherence_score = _calculate_budget_adherence_score(month['spend_by_cat'], budgets)
+    income_expense_score = scoring.income_expense_score(total_income, total_expenses)
 
     # --- Final Score ---
     final_score = savings_rate_score + budget_adherence_score + income_expense_score
     
-    score_color = "green" if final_score >= 75 else "yellow" if final_score >= 50 else "red"
+    score_color = scoring.HEALTH_COLORS[scoring.health_level(final_score)]
 
     # --- Display ---
     score_text = (
@@ -171,12 +152,12 @@ def financial_health_score():
     console.print(panel)
     _interpret_score(final_score)
 
-def show_financial_summary_and_recommendations():
+def show_financial_summary_and_recommendations(transactions=None, budgets=None):
     """Shows a summary and recommendations from the Smart Financial Assistant."""
     console.print("\n[bold cyan]-- Financial Summary & Recommendations --[/bold cyan]")
     
-    all_transactions = transaction_features._read_transactions()
-    all_budgets = budget_features._read_budgets()
+    all_transactions = transaction_features._read_transactions() if transactions is None else transactions
+    all_budgets = budget_features._read_budgets() if budgets is None else budgets
 
     recommendations = smart_assistant.get_recommendations(all_transactions, all_budgets)
 
@@ -201,17 +182,48 @@ def generate_monthly_report():
     
     console.print(f"\n[bold]Report for: {now.strftime('%B %Y')}[/bold]")
     
+    from features.transactions._cache import load_df
+
+    # Read the data once and share it across every section of the report
+    transactions_df = load_df()
+    all_budgets = budget_features._read_budgets()
+
     # --- Use existing functions to display sections of the report ---
-    analyze_income()
-    analyze_spending()
-    analyze_savings()
-    show_financial_summary_and_recommendations()
+    analyze_income(transactions_df)
+    analyze_spending(transactions_df)
+    analyze_savings(transactions_df)
+    show_financial_summary_and_recommendations(list(transactions_df.itertuples(index=False, name="Tx")), all_budgets)
     
     console.print("\n[bold green]End of Report.[/bold green]")
 
 
 # --- Helper Functions ---
 
+def _aggregate_month(transactions_df, month_start, month_end=None):
+    """Totals income and expenses since `month_start` (and before `month_end`, if given), by category and overall."""
+    import pandas as pd
+
+    in_month = transactions_df['date'] >= pd.Timestamp(month_start)
+    if month_end is not None:
+        in_month &= transactions_df['date'] < pd.Timestamp(month_end)
+    # Newest first without sorting the groups, so categories come out in order of their most recent transaction
+    monthly_df = transactions_df[in_month].sort_values('date', ascending=False, kind='stable')
+    totals = monthly_df.groupby(['type', 'category'], sort=False)['amount'].sum()
+    totals_by_type = {
+        trans_type: group.droplevel('type').to_dict()
+        for trans_type, group in totals.groupby(level='type', sort=False)
+    }
+    spend_by_cat = totals_by_type.get('expense', {})
+    income_by_src = totals_by_type.get('income', {})
+
+    return {
+        "spend_by_cat": spend_by_cat,
+        "income_by_src": income_by_src,
+        "total_income": sum(income_by_src.values()),
+        "total_expenses": sum(spend_by_cat.values()),
+        "days": (datetime.now().date() - month_start).days + 1,
+    }
+
 def _display_pie_chart(spending_by_category, total_spent):
     """Displays an ASCII pie chart."""
     console.print("\n[bold]Spending by Category:[/bold]")
@@ -220,74 +232,34 @@ def _display_pie_chart(spending_by_category, total_spent):
 
     sorted_categories = sorted(spending_by_category.items(), key=lambda item: item[1], reverse=True)
 
+    lines = []
     for category, amount in sorted_categories:
         percentage = (amount / total_spent) * 100
         bar_length = int(percentage / 2)
         bar = '█' * bar_length
-        console.print(f"{category:<15} {bar} {percentage:.1f}%")
+        lines.append(f"{category:<15} {bar} {percentage:.1f}%")
+    console.print("\n".join(lines))
 
-def _calculate_savings_rate_score(total_income, total_expenses):
-    """Calculates the savings rate score (max 40)."""
-    if total_income == 0:
-        return 0
-    savings_rate = ((total_income - total_expenses) / total_income) * 100
-    if savings_rate >= 20:
-        return 40
-    elif savings_rate >= 10:
-        return 30
-    elif savings_rate >= 0:
-        return 20
-    else:
-        return 0
-
-def _calculate_budget_adherence_score(monthly_transactions, budgets):
-    """Calculates the budget adherence score (max 35)."""
+def _calculate_budget_adherence_score(spending_by_category, budgets):
+    """Calculates the budget adherence score (max 35) from this month's spending per category."""
     if not budgets:
         return 0
-    
-    total_budget_utilized = 0
-    num_budgeted_categories = 0
-    
-    for category, budget_amount in budgets.items():
-        spent = sum(
-            t['amount'] for t in monthly_transactions 
-            if t['type'] == 'expense' and t['category'] == category
-        )
-        if budget_amount > 0:
-            utilization = (spent / budget_amount) * 100
-            total_budget_utilized += min(utilization, 100)
-            num_budgeted_categories += 1
-
-    if num_budgeted_categories == 0:
-        return 35
 
-    avg_utilization = total_budget_utilized / num_budgeted_categories
-    
-    if avg_utilization <= 80:
+    import numpy as np
+    import pandas as pd
+
+    budget_amounts = pd.Series(budgets, dtype=float)
+    budget_amounts = budget_amounts[budget_amounts > 0]
+
+    if budget_amounts.empty:
         return 35
-    elif avg_utilization <= 90:
-        return 25
-    elif avg_utilization <= 100:
-        return 15
-    else:
-        return 5
-
-def _calculate_income_expense_score(total_income, total_expenses):
-    """Calculates the income vs. expense score (max 25)."""
-    if total_income == 0:
-        return 0
-    if total_income > total_expenses:
-        return 25
-    elif total_income * 0.9 < total_expenses:
-        return 10
-    else:
-        return 0
+
+    spent = pd.Series(spending_by_category, dtype=float).reindex(budget_amounts.index, fill_value=0)
+    avg_utilization = np.minimum(spent / budget_amounts * 100, 100).mean()
+    return scoring.budget_adherence_score(avg_utilization)
 
 def _interpret_score(score):
     """Prints an interpretation of the financial health score."""
-    if score >= 75:
-        console.print("[bold green]Excellent! Your finances are in great shape. Keep up the good work![/bold green]")
-    elif score >= 50:
-        console.print("[bold yellow]Good. There's room for improvement, but you're on the right track.[/bold yellow]")
-    else:
-        console.print("[bold red]Needs Attention. Your finances require careful review. Focus on budgeting and saving.[/bold red]")
+    level = scoring.health_level(score)
+    color = scoring.HEALTH_COLORS[level]
+    console.print(f"[bold {color}]{scoring.HEALTH_MESSAGES[level]}[/bold {color}]")
@@ -0,0 +1,43 @@
+# features/analytics/scoring.py
+
+import bisect
+
+# --- Score Tables ---
+# Shared by the CLI health score and the dashboard's Analytics page, so both always score the same way.
+# Each score is looked up by bisecting its thresholds, so bin i covers values between thresholds i-1 and i
+_SAVINGS_THRESH = [0, 10, 20]           # savings rate %, lower bound inclusive
+_SAVINGS_SCORE = [0, 20, 30, 40]
+_ADHERENCE_THRESH = [80, 90, 100]       # average budget utilization %, upper bound inclusive
+_ADHERENCE_SCORE = [35, 25, 15, 5]
+_INCOME_EXPENSE_THRESH = [1]            # expenses / income
+_INCOME_EXPENSE_SCORE = [25, 10]
+_HEALTH_THRESH = [50, 75]               # overall score, lower bound inclusive
+HEALTH_COLORS = ["red", "yellow", "green"]
+HEALTH_MESSAGES = [
+    "Needs Attention. Your finances require careful review. Focus on budgeting and saving.",
+    "Good. There's room for improvement, but you're on the right track.",
+    "Excellent! Your finances are in great shape. Keep up the good work!",
+]
+
+# --- Scoring Functions ---
+
+def savings_rate_score(total_income, total_expenses):
+    """Calculates the savings rate score (max 40)."""
+    if total_income == 0:
+        return 0
+    savings_rate = ((total_income - total_expenses) / total_income) * 100
+    return _SAVINGS_SCORE[bisect.bisect_right(_SAVINGS_THRESH, savings_rate)]
+
+def budget_adherence_score(avg_utilization):
+    """Calculates the budget adherence score (max 35) from the average budget utilization %."""
+    return _ADHERENCE_SCORE[bisect.bisect_left(_ADHERENCE_THRESH, avg_utilization)]
+
+def income_expense_score(total_income, total_expenses):
+    """Calculates the income vs. expense score (max 25)."""
+    if total_income == 0:
+        return 0
+    return _INCOME_EXPENSE_SCORE[bisect.bisect_right(_INCOME_EXPENSE_THRESH, total_expenses / total_income)]
+
+def health_level(score):
+    """Returns the index into HEALTH_COLORS and HEALTH_MESSAGES for an overall score."""
+    return bisect.bisect_right(_HEALTH_THRESH, score)
@@ -1,11 +1,7 @@
-import questionary
+import os
 from rich.console import Console
 from rich.table import Table
-from rich.progress_bar import ProgressBar
-from datetime import datetime
-
-# Import the helper function from the transactions module
-from features.transactions import transactions as transaction_features
+from datetime import datetime, timedelta
 
 # Initialize Rich Console
 console = Console()
@@ -20,6 +16,8 @@ BUDGETS_FILE = "database/budgets.txt"
 
 def set_budget():
     """Sets a monthly budget for a specific category."""
+    import questionary
+
     console.print("\n[bold cyan]-- Set Monthly Budget --[/bold cyan]")
     try:
         category = questionary.select(
@@ -47,6 +45,10 @@ def set_budget():
 
 def view_budget():
     """Displays the budget vs. actual spending for the current month."""
+    from rich.progress_bar import ProgressBar
+    from features.analytics.analytics import _aggregate_month
+    from features.transactions._cache import load_df_since
+
     console.print("\n[bold cyan]-- Monthly Budget Status --[/bold cyan]")
     
     budgets = _read_budgets()
@@ -54,25 +56,12 @@ def view_budget():
         console.print("[yellow]No budgets set. Please use 'Set Budget' first.[/yellow]")
         return
 
-    all_transactions = transaction_features._read_transactions()
     now = datetime.now()
-    
-    # Calculate spending per category for the current month
-    monthly_spending = {category: 0 for category in budgets}
-    for t in all_transactions:
-        if t['type'] == 'expense' and t['date'].month == now.month and t['date'].year == now.year:
-            if t['category'] in monthly_spending:
-                monthly_spending[t['category']] += t['amount']
-
-    # Create and display the budget table
-    table = Table(title=f"Budget for {now.strftime('%B %Y')}", header_style="bold magenta")
-    table.add_column("Category", style="cyan")
-    table.add_column("Budget", justify="right")
-    table.add_column("Spent", justify="right")
-    table.add_column("Remaining", justify="right")
-    table.add_column("Utilization", justify="center", width=20)
-    table.add_column("Status")
+    month_start = now.date().replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    monthly_spending = _aggregate_month(load_df_since(month_start), month_start, next_month_start)['spend_by_cat']
 
+    rows = []
     for category, budget_amount in budgets.items():
         spent_amount = monthly_spending.get(category, 0)
         remaining = budget_amount - spent_amount
@@ -86,17 +75,25 @@ def view_budget():
         else:
             status, color = "OK", "green"
 
-        # Create progress bar
-        progress = ProgressBar(total=100, completed=min(utilization, 100), width=15, complete_style=color)
-
-        table.add_row(
+        rows.append((
             category,
             f"{budget_amount / 100:.2f}",
             f"[{color}]{spent_amount / 100:.2f}[/{color}]",
             f"{remaining / 100:.2f}",
-            progress,
+            ProgressBar(total=100, completed=min(utilization, 100), width=15, complete_style=color),
             f"[{color}]{status}[/{color}]"
-        )
+        ))
+
+    # Create and display the budget table
+    table = Table(title=f"Budget for {now.strftime('%B %Y')}", header_style="bold magenta")
+    table.add_column("Category", style="cyan")
+    table.add_column("Budget", justify="right")
+    table.add_column("Spent", justify="right")
+    table.add_column("Remaining", justify="right")
+    table.add_column("Utilization", justify="center", width=20)
+    table.add_column("Status")
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
 
@@ -105,19 +102,21 @@ def view_budget():
 
 def _read_budgets():
     """Reads all budgets from the file."""
-    budgets = {}
     try:
         with open(BUDGETS_FILE, "r") as f:
-            for line in f:
-                if line.strip():
-                    category, amount_cents = line.strip().split(',')
-                    budgets[category] = int(amount_cents)
+            text = f.read()
     except FileNotFoundError:
-        pass
-    return budgets
+        return {}
+    return {
+        category: int(amount_cents)
+        for category, amount_cents in (line.strip().split(',') for line in text.splitlines() if line.strip())
+    }
 
 def _write_budgets(budgets):
     """Writes all budgets to the file, overwriting it."""
-    with open(BUDGETS_FILE, "w") as f:
-        for category, amount in budgets.items():
-            f.write(f"{category},{amount}\n")
\ No newline at end of file
+    payload = "".join(f"{category},{amount}\n" for category, amount in budgets.items())
+    # Write to a temporary file first so an interrupted write never leaves a half-written budgets file
+    tmp_path = BUDGETS_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(payload)
+    os.replace(tmp_path, BUDGETS_FILE)
@@ -1,15 +1,13 @@
 # features/data_management/data_management.py
 
 import os
-import shutil
 import datetime
-import json
-import csv
-import questionary
 
 from rich.console import Console
 from rich.table import Table
 
+from features.transactions.parser import iter_transaction_rows, transaction_record
+
 console = Console()
 
 DATABASE_DIR = "database"
@@ -20,90 +18,104 @@ BUDGETS_FILE = os.path.join(DATABASE_DIR, "budgets.txt")
 def export_data_to_csv():
     """Exports transaction and budget data to CSV files."""
     console.print("[bold cyan]Exporting data to CSV...[/bold cyan]")
-    # Export transactions to CSV
-    transactions_csv_path = "transactions_export.csv"
-    try:
-        with open(TRANSACTIONS_FILE, 'r') as infile, open(transactions_csv_path, 'w', newline='') as outfile:
-            writer = csv.writer(outfile)
-            writer.writerow(["Date", "Type", "Category/Source", "Description", "Amount"]) # Header
-            for line in infile:
-                parts = line.strip().rsplit(',', 4)
-                if len(parts) == 5:
-                    writer.writerow(parts)
-                else: # Handle cases where description might be empty
-                    parts = line.strip().rsplit(',', 3)
-                    if len(parts) == 4:
-                        writer.writerow(parts[:3] + [""] + parts[3:])
-        console.print(f"[green]Transactions exported to {transactions_csv_path}[/green]")
-    except FileNotFoundError:
-        console.print(f"[yellow]'{TRANSACTIONS_FILE}' not found. No transactions to export.[/yellow]")
-    except Exception as e:
-        console.print(f"[red]Error exporting transactions: {e}[/red]")
-
-    # Export budgets to CSV
-    budgets_csv_path = "budgets_export.csv"
-    try:
-        with open(BUDGETS_FILE, 'r') as infile, open(budgets_csv_path, 'w', newline='') as outfile:
-            writer = csv.writer(outfile)
-            writer.writerow(["Category", "Amount"]) # Header
-            for line in infile:
-                parts = line.strip().split(',', 1) # Split by comma, max 1 split
-                writer.writerow(parts)
-        console.print(f"[green]Budgets exported to {budgets_csv_path}[/green]")
-    except FileNotFoundError:
-        console.print(f"[yellow]'{BUDGETS_FILE}' not found. No budgets to export.[/yellow]")
-    except Exception as e:
-        console.print(f"[red]Error exporting budgets: {e}[/red]")
+    _write_csv_exports(*_read_export_data())
     console.print("[bold green]Data exported to CSV successfully![/bold green]")
 
 def export_data_to_json():
     """Exports all data to a single JSON file."""
     console.print("[bold cyan]Exporting data to JSON...[/bold cyan]")
-    data = {"transactions": [], "budgets": []}
-    json_export_path = "all_data_export.json"
+    _write_json_export(*_read_export_data())
+    console.print("[bold green]Data exported to JSON successfully![/bold green]")
 
-    # Read transactions
+def export_all():
+    """Exports data to both CSV and JSON, parsing the database files only once."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    console.print("[bold cyan]Exporting data to CSV and JSON...[/bold cyan]")
+    transaction_rows, budget_rows = _read_export_data()
+
+    # Both writers only read the shared rows, so they can run side by side while each waits on its own file
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_write_csv_exports, transaction_rows, budget_rows),
+            executor.submit(_write_json_export, transaction_rows, budget_rows),
+        ]
+    for future in futures:
+        future.result()
+    console.print("[bold green]Data exported to CSV and JSON successfully![/bold green]")
+
+def _read_export_data():
+    """Parses the transactions and budgets files once for the exporters; a missing or unreadable file gives None."""
     try:
         with open(TRANSACTIONS_FILE, 'r') as infile:
-            for line in infile:
-                parts = line.strip().rsplit(',', 4)
-                if len(parts) == 5:
-                    data["transactions"].append({
-                        "date": parts[0],
-                        "type": parts[1],
-                        "category_source": parts[2],
-                        "description": parts[3],
-                        "amount": int(parts[4])
-                    })
-                else: # Handle cases where description might be empty
-                    parts = line.strip().rsplit(',', 3)
-                    if len(parts) == 4:
-                        data["transactions"].append({
-                            "date": parts[0],
-                            "type": parts[1],
-                            "category_source": parts[2],
-                            "description": "",
-                            "amount": int(parts[3])
-                        })
+            transaction_rows = list(iter_transaction_rows(infile.read().splitlines()))
     except FileNotFoundError:
         console.print(f"[yellow]'{TRANSACTIONS_FILE}' not found. No transactions to export.[/yellow]")
+        transaction_rows = None
     except Exception as e:
-        console.print(f"[red]Error reading transactions for JSON export: {e}[/red]")
+        console.print(f"[red]Error reading transactions for export: {e}[/red]")
+        transaction_rows = None
 
-    # Read budgets
     try:
         with open(BUDGETS_FILE, 'r') as infile:
-            for line in infile:
-                parts = line.strip().split(',', 1)
+            budget_rows = [line.strip().split(',', 1) for line in infile.read().splitlines()] # Split by comma, max 1 split
+    except FileNotFoundError:
+        console.print(f"[yellow]'{BUDGETS_FILE}' not found. No budgets to export.[/yellow]")
+        budget_rows = None
+    except Exception as e:
+        console.print(f"[red]Error reading budgets for export: {e}[/red]")
+        budget_rows = None
+
+    return transaction_rows, budget_rows
+
+def _write_csv_exports(transaction_rows, budget_rows):
+    """Writes the parsed transactions and budgets to their CSV files."""
+    import csv
+
+    # Export transactions to CSV
+    transactions_csv_path = "transactions_export.csv"
+    if transaction_rows is not None:
+        try:
+            with open(transactions_csv_path, 'w', newline='') as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(["Date", "Type", "Category/Source", "Description", "Amount"]) # Header
+                writer.writerows(transaction_rows)
+            console.print(f"[green]Transactions exported to {transactions_csv_path}[/green]")
+        except Exception as e:
+            console.print(f"[red]Error exporting transactions: {e}[/red]")
+
+    # Export budgets to CSV
+    budgets_csv_path = "budgets_export.csv"
+    if budget_rows is not None:
+        try:
+            with open(budgets_csv_path, 'w', newline='') as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(["Category", "Amount"]) # Header
+                writer.writerows(budget_rows)
+            console.print(f"[green]Budgets exported to {budgets_csv_path}[/green]")
+        except Exception as e:
+            console.print(f"[red]Error exporting budgets: {e}[/red]")
+
+def _write_json_export(transaction_rows, budget_rows):
+    """Writes the parsed transactions and budgets to a single JSON file."""
+    import json
+
+    data = {"transactions": [], "budgets": []}
+    json_export_path = "all_data_export.json"
+
+    if transaction_rows is not None:
+        data["transactions"] = [transaction_record(row) for row in transaction_rows]
+
+    if budget_rows is not None:
+        try:
+            for parts in budget_rows:
                 if len(parts) == 2:
                     data["budgets"].append({
                         "category": parts[0],
                         "amount": int(parts[1])
                     })
-    except FileNotFoundError:
-        console.print(f"[yellow]'{BUDGETS_FILE}' not found. No budgets to export.[/yellow]")
-    except Exception as e:
-        console.print(f"[red]Error reading budgets for JSON export: {e}[/red]")
+        except Exception as e:
+            console.print(f"[red]Error reading budgets for JSON export: {e}[/red]")
 
     # Write to JSON file
     try:
@@ -112,10 +124,11 @@ def export_data_to_json():
         console.print(f"[green]All data exported to {json_export_path}[/green]")
     except Exception as e:
         console.print(f"[red]Error writing JSON export: {e}[/red]")
-    console.print("[bold green]Data exported to JSON successfully![/bold green]")
 
 def create_backup():
     """Creates a timestamped backup of the current database."""
+    import zipfile
+
     console.print("[bold cyan]Creating backup...[/bold cyan]")
     # Ensure backup directory exists
     os.makedirs(BACKUP_DIR, exist_ok=True)
@@ -124,25 +137,37 @@ def create_backup():
     backup_name = f"backup_{timestamp}"
     backup_path = os.path.join(BACKUP_DIR, backup_name)
 
-    # Create a zip archive of the database files
-    shutil.make_archive(backup_path, 'zip', root_dir=DATABASE_DIR)
+    # Create a zip archive of the database files, leaving out earlier backups.
+    # The files are small plain text, so the fastest deflate level compresses nearly as well as the default.
+    with zipfile.ZipFile(backup_path + ".zip", 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for root, dirs, files in os.walk(DATABASE_DIR):
+            if root == DATABASE_DIR and "backups" in dirs:
+                dirs.remove("backups")
+            for name in files:
+                file_path = os.path.join(root, name)
+                archive.write(file_path, os.path.relpath(file_path, DATABASE_DIR))
     console.print(f"[bold green]Backup created: {backup_path}.zip[/bold green]")
 
 def restore_backup():
     """Restores data from a selected backup."""
+    import questionary
+    import zipfile
+
     console.print("[bold cyan]Restoring backup...[/bold cyan]")
     # Ensure backup directory exists
     if not os.path.exists(BACKUP_DIR):
         console.print("[yellow]No backups found.[/yellow]")
         return
 
-    backups = [f for f in os.listdir(BACKUP_DIR) if f.startswith("backup_") and f.endswith(".zip")]
-    if not backups:
+    with os.scandir(BACKUP_DIR) as entries:
+        backup_choices = {
+            entry.name[:-4]: entry.path
+            for entry in entries if entry.name.startswith("backup_") and entry.name.endswith(".zip")
+        }
+    if not backup_choices:
         console.print("[yellow]No backups found.[/yellow]")
         return
 
-    backup_choices = {os.path.basename(f).replace(".zip", ""): os.path.join(BACKUP_DIR, f) for f in backups}
-
     selected_backup_name = questionary.select(
         "Select a backup to restore:",
         choices=list(backup_choices.keys())
@@ -155,14 +180,16 @@ def restore_backup():
     selected_backup_path = backup_choices[selected_backup_name]
 
     try:
-        # Clear existing database files before restoring
-        if os.path.exists(TRANSACTIONS_FILE):
-            os.remove(TRANSACTIONS_FILE)
-        if os.path.exists(BUDGETS_FILE):
-            os.remove(BUDGETS_FILE)
-
-        # Extract the backup
-        shutil.unpack_archive(selected_backup_path, DATABASE_DIR, 'zip')
+        # Extract the backup over the current files. Older backups also hold the backups folder,
+        # which is skipped so the archive being read is never overwritten.
+        with zipfile.ZipFile(selected_backup_path) as archive:
+            members = [name for name in archive.namelist() if not name.startswith("backups/")]
+            archive.extractall(DATABASE_DIR, members)
+
+        # Clear database files the backup didn't contain
+        for path in (TRANSACTIONS_FILE, BUDGETS_FILE):
+            if os.path.relpath(path, DATABASE_DIR) not in members and os.path.exists(path):
+                os.remove(path)
         console.print(f"[bold green]Backup '{selected_backup_name}' restored successfully![/bold green]")
     except Exception as e:
         console.print(f"[red]Error restoring backup: {e}[/red]")
@@ -170,6 +197,8 @@ def restore_backup():
 
 def main():
     """Main function for data management features."""
+    import questionary
+
     console.print("[bold magenta]Data Management Options:[/bold magenta]")
     while True:
         choice = questionary.select(
@@ -177,6 +206,7 @@ def main():
             choices=[
                 "Export data to CSV",
                 "Export data to JSON",
+                "Export data to CSV and JSON",
                 "Create backup",
                 "Restore backup",
                 "Back to Main Menu"
@@ -187,6 +217,8 @@ def main():
             export_data_to_csv()
         elif choice == "Export data to JSON":
             export_data_to_json()
+        elif choice == "Export data to CSV and JSON":
+            export_all()
         elif choice == "Create backup":
             create_backup()
         elif choice == "Restore backup":
@@ -1,22 +1,20 @@
 # features/smart_assistant/smart_assistant.py
 
-def detect_unusual_spending(transactions, new_transaction):
+from collections import defaultdict
+from operator import itemgetter
+
+def detect_unusual_spending(category_stats, amount):
     """
-    Detects if a new transaction is unusually high for its category.
+    Detects if a new transaction is unusually high for its category,
+    given the (count, total) of the category's amounts.
     """
-    category = new_transaction['category']
-    amount = new_transaction['amount']
-
-    # Get all transactions in the same category
-    category_transactions = [
-        t['amount'] for t in transactions if t['category'] == category
-    ]
+    category_count, category_total = category_stats
 
-    if not category_transactions:
+    if not category_count:
         return False  # Not enough data to compare
 
     # Calculate the average spending for the category
-    average_spending = sum(category_transactions) / len(category_transactions)
+    average_spending = category_total / category_count
 
     # Define a threshold for "unusual"
     # For simplicity, we'll say anything 2x the average is unusual.
@@ -30,19 +28,18 @@ def detect_unusual_spending(transactions, new_transaction):
 
 def get_recommendations(transactions, budgets):
     """
-    Generates personalized financial recommendations.
+    Generates personalized financial recommendations from transaction
+    records with type, category and amount (in cents) attributes.
     """
     recommendations = []
 
     # Recommendation 1: Identify categories with high spending but no budget
-    spending_by_category = {}
+    spending_by_category = defaultdict(int)
     for t in transactions:
-        if t['type'] == 'expense':
-            category = t['category']
-            amount = t['amount']
-            spending_by_category[category] = spending_by_category.get(category, 0) + amount
+        if t.type == 'expense':
+            spending_by_category[t.category] += t.amount
     
-    budgeted_categories = set(budgets.keys())
+    budgeted_categories = frozenset(budgets)
 
     for category, total_spent in spending_by_category.items():
         if category not in budgeted_categories and total_spent > 20000: # Example threshold: 200.00
@@ -53,7 +50,7 @@ def get_recommendations(transactions, budgets):
 
     # Recommendation 2: Savings opportunities
     if spending_by_category:
-        highest_spending_category = max(spending_by_category, key=spending_by_category.get)
+        highest_spending_category, _ = max(spending_by_category.items(), key=itemgetter(1))
         recommendations.append(
             f"Your highest spending category is '{highest_spending_category}'. "
             f"Reviewing your spending here could be a good way to save money."
@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import zlib
+import pandas as pd
+
+from features.transactions.transactions import TRANSACTIONS_FILE
+
+COLUMNS = ["date", "type", "category", "description", "amount"]
+
+# Maps "YYYY-MM" to the [offset, length] byte ranges of that month's lines in the transactions file
+INDEX_FILE = os.path.join(os.path.dirname(TRANSACTIONS_FILE), "tx_index.json")
+
+# Bytes read at a time when checksumming the indexed part of the file
+_CRC_BLOCK_SIZE = 1 << 20
+
+# Parsed DataFrame, keyed on the file's (mtime, size) so edits invalidate it
+_DF_CACHE = {"key": None, "df": None}
+
+# --- Helper Functions ---
+
+def load_df():
+    """Loads all transactions into a DataFrame, parsing the file only when it has changed.
+
+    The returned DataFrame is shared between callers and must not be modified in place.
+    """
+    try:
+        stat = os.stat(TRANSACTIONS_FILE)
+    except FileNotFoundError:
+        return pd.DataFrame(columns=COLUMNS)
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _DF_CACHE["key"] != key:
+        _DF_CACHE["df"] = _parse_transactions(TRANSACTIONS_FILE)
+        _DF_CACHE["key"] = key
+    return _DF_CACHE["df"]
+
+def load_df_since(month_start):
+    """Loads transactions from `month_start`'s month onwards, parsing only those months' lines."""
+    first_month = f"{month_start.year:04d}-{month_start.month:02d}"
+    ranges = sorted(
+        byte_range
+        for month, month_ranges in _load_month_index().items() if month >= first_month
+        for byte_range in month_ranges
+    )
+    if not ranges:
+        return pd.DataFrame(columns=COLUMNS)
+
+    chunks = []
+    with open(TRANSACTIONS_FILE, "rb") as f:
+        for offset, length in ranges:
+            f.seek(offset)
+            chunks.append(f.read(length))
+    return _parse_transactions(io.BytesIO(b"".join(chunks)))
+
+def _load_month_index():
+    """Returns the month index, extending it over appended lines or rebuilding it if the file was rewritten."""
+    try:
+        stat = os.stat(TRANSACTIONS_FILE)
+    except FileNotFoundError:
+        return {}
+    source = [stat.st_mtime_ns, stat.st_size]
+
+    try:
+        with open(INDEX_FILE, "r") as f:
+            index = json.load(f)
+        if index.get("source") == source:
+            return index["months"]
+        indexed_size, crc, months = index["source"][1], index.get("crc"), index["months"]
+    except (FileNotFoundError, ValueError, KeyError, IndexError, TypeError):
+        indexed_size, crc, months = 0, None, {}
+
+    # Extend the index only if the file grew and its indexed part is byte for byte the one that was indexed
+    if not (crc is not None and 0 < indexed_size < stat.st_size and _prefix_crc(indexed_size) == crc):
+        indexed_size, crc, months = 0, 0, {}  # Truncated or rewritten, so the recorded ranges no longer hold
+    months, crc = _build_month_index(months, indexed_size, crc)
+    try:
+        with open(INDEX_FILE, "w") as f:
+            json.dump({"source": source, "crc": crc, "months": months}, f)
+    except OSError:
+        pass  # The index is only an optimization; it is rebuilt on the next read
+    return months
+
+def _prefix_crc(size):
+    """Returns the CRC32 of the transactions file's first `size` bytes."""
+    crc = 0
+    with open(TRANSACTIONS_FILE, "rb") as f:
+        while size > 0:
+            block = f.read(min(size, _CRC_BLOCK_SIZE))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            size -= len(block)
+    return crc
+
+def _build_month_index(months=None, offset=0, crc=0):
+    """Scans the transactions file from `offset`, grouping consecutive lines of the same month into byte ranges.
+
+    The ranges are added to `months`, so an index built up to `offset` is extended over the lines after it.
+    Also returns the CRC32 of the file up to its end, continuing `crc` (that of the bytes before `offset`),
+    or None if the file doesn't end a line, since an append would then continue the last indexed line.
+    """
+    months = {} if months is None else months
+    with open(TRANSACTIONS_FILE, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    for line in io.BytesIO(data):
+        month = line[:7].decode("utf-8", errors="replace")
+        month_ranges = months.setdefault(month, [])
+        if month_ranges and month_ranges[-1][0] + month_ranges[-1][1] == offset:
+            month_ranges[-1][1] += len(line)
+        else:
+            month_ranges.append([offset, len(line)])
+        offset += len(line)
+    return months, (zlib.crc32(data, crc) if data.endswith(b"\n") else None)
+
+def _parse_transactions(source):
+    """Parses transactions from a path or buffer with the C CSV parser, dropping malformed rows."""
+    try:
+        df = pd.read_csv(
+            source,
+            names=COLUMNS,
+            header=None,
+            dtype={"description": str},
+            keep_default_na=False,
+            on_bad_lines="skip",
+            engine="c",
+        )
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=COLUMNS)
+
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+    df = df.dropna(subset=["date", "amount"])
+    df["amount"] = df["amount"].astype("int64")
+    return df.reset_index(drop=True)
@@ -0,0 +1,34 @@
+# features/transactions/parser.py
+
+import re
+
+# date,type,category[,description],amount_cents  (the description may itself contain commas)
+_LINE_RE = re.compile(r'^([^,]+),([^,]+),([^,]+),(?:(.*),)?(\d+)$')
+
+def iter_transaction_rows(lines):
+    """Yields (date, type, category, description, amount) for each well-formed transaction line."""
+    for line in lines:
+        m = _LINE_RE.match(line.strip())
+        if m:
+            description = m.group(4) or ""
+            if len(description) > 1 and description[0] == description[-1] == '"':
+                description = description[1:-1].replace('""', '"')  # Written quoted because it holds a comma
+            yield m.group(1, 2, 3) + (description, m.group(5))
+
+def transaction_record(row):
+    """Turns a parsed transaction row into a dict, with the amount in cents."""
+    date, type, category, description, amount = row
+    return {
+        "date": date,
+        "type": type,
+        "category_source": category,
+        "description": description,
+        "amount": int(amount)
+    }
+
+def iter_transactions(path):
+    """Yields each well-formed transaction in the file as a dict, with the amount in cents."""
+    with open(path, 'r') as infile:
+        lines = infile.read().splitlines()
+    for row in iter_transaction_rows(lines):
+        yield transaction_record(row)
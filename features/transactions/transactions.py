@@ -1,8 +1,16 @@
+import atexit
+import bisect
+import csv
+import mmap
+import os
 import questionary
+import struct
+import zlib
+from collections import namedtuple
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from datetime import datetime
+from datetime import date, datetime
 from features.smart_assistant.smart_assistant import detect_unusual_spending
 
 # Initialize Rich Console
@@ -15,32 +23,259 @@ INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "O
 # --- File Path ---
 TRANSACTIONS_FILE = "database/transactions.txt"
 
+# Sidecar with the transactions file's (mtime, size) and its income and expense totals in cents,
+# so the balance can be shown without parsing the file
+BALANCE_FILE = os.path.join(os.path.dirname(TRANSACTIONS_FILE), "balance.bin")
+_BALANCE = struct.Struct("<qqqq")
+
+# A parsed transaction; the amount is in cents
+Tx = namedtuple("Tx", "date type category description amount")
+
+# Shared string objects for the small set of types and categories, so every transaction reuses the same keys.
+# Seeded with the constants above, so parsed values are the very objects the code compares them against.
+_STRING_POOL = {s: s for s in EXPENSE_CATEGORIES + INCOME_CATEGORIES + ["expense", "income"]}
+
+# Parsed transactions, newest first, keyed on the file's (mtime, size) so outside edits invalidate it.
+# "offset" is how far the file has been parsed and "crc" the checksum of those bytes, so an append only parses the
+# new lines while any other change to the file (even one that keeps its size) is parsed again from the start.
+# "stats" keeps a running (count, total) of amounts per category and "totals" the sum per type, both updated
+# as lines are parsed, and "rows" the list_transactions table row for each transaction in "data".
+_CACHE = {"key": None, "data": [], "rows": [], "offset": 0, "lines": 0, "crc": 0, "stats": {}, "totals": {}}
+
+# Append-mode handle to the transactions file, opened on the first add and kept for the session
+_APPEND = {"file": None}
+
+# New lines needed before parsing is split across worker processes. Shipping the parsed rows back costs
+# about as much as parsing them, so the pool only pays off for large batches on several CPUs.
+_PARALLEL_MIN_LINES = 200_000
+_PARALLEL_MIN_CPUS = 4
+
+# Table colors for a transaction row, indexed by whether it is an expense
+_ROW_COLORS = ("green", "red")
+
+# Appends of up to this many lines are inserted into the sorted cache instead of re-sorting it
+_INSORT_MAX_LINES = 64
+
 # --- Helper Functions ---
 
+def _file_key():
+    """Returns the (mtime, size) of the transactions file, or None if it doesn't exist yet."""
+    try:
+        stat = os.stat(TRANSACTIONS_FILE)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 def _read_transactions():
-    """Reads all transactions from the file."""
-    transactions = []
+    """Reads all transactions from the file, parsing only the lines appended since the last read.
+
+    The returned list is shared between callers and must not be modified.
+    """
+    key = _file_key()
+    if key is None or key[1] == 0:
+        _reset_cache(key)
+        return _CACHE["data"]  # File might not exist yet (and an empty file can't be mapped), return empty list
+    if key == _CACHE["key"]:
+        return _CACHE["data"]
+
+    with open(TRANSACTIONS_FILE, "rb") as f:
+        # Map the file instead of reading it, so the append check and the new lines are read in place
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if not _is_append(mm):
+                _reset_cache()
+            new_bytes = mm[_CACHE["offset"]:]
+
+    # Large batches of new lines (a big file's first read) are parsed in parallel worker processes
+    if (os.cpu_count() or 1) >= _PARALLEL_MIN_CPUS and new_bytes.count(b"\n") >= _PARALLEL_MIN_LINES:
+        results = _parse_parallel(new_bytes)
+    else:
+        results = [_parse_lines(new_bytes)]
+
+    new_transactions, new_rows = [], []
+    line_num = _CACHE["lines"]
+    for transactions, rows, malformed, line_count in results:
+        for chunk_line_num, line, e in malformed:
+            console.print(
+                f"[bold yellow]Warning: Skipping malformed transaction on line {line_num + chunk_line_num} "
+                f"in {TRANSACTIONS_FILE}: {line} ({e})[/bold yellow]"
+            )
+        new_transactions += transactions
+        new_rows += rows
+        line_num += line_count
+
+    stats, totals = _CACHE["stats"], _CACHE["totals"]
+    for t in new_transactions:
+        count, total = stats.get(t.category, (0, 0))
+        stats[t.category] = (count + 1, total + t.amount)
+        totals[t.type] = totals.get(t.type, 0) + t.amount
+
+    if new_transactions and _CACHE["data"] and len(new_transactions) <= _INSORT_MAX_LINES:
+        # A few appended lines (the usual add) are inserted in place, keeping newest first without any sort
+        data, rows = _CACHE["data"], _CACHE["rows"]
+        for t, row in zip(new_transactions, new_rows):
+            i = bisect.bisect_right(data, _newest_first(t), key=_newest_first)
+            data.insert(i, t)
+            rows.insert(i, row)
+    elif new_transactions:
+        # The cached list is already sorted, so the stable sort only has to merge the new run in after it
+        entries = sorted(
+            zip(_CACHE["data"] + new_transactions, _CACHE["rows"] + new_rows),
+            key=lambda entry: entry[0].date,
+            reverse=True
+        )
+        _CACHE["data"] = [t for t, _ in entries]
+        _CACHE["rows"] = [row for _, row in entries]
+    _CACHE["offset"] += len(new_bytes)
+    _CACHE["lines"] = line_num
+    _CACHE["crc"] = zlib.crc32(new_bytes, _CACHE["crc"])
+    _CACHE["key"] = key
+    return _CACHE["data"]
+
+def _reset_cache(key=None):
+    """Empties the parsed transactions cache, so the next read parses the file from the start."""
+    _CACHE.update(key=key, data=[], rows=[], offset=0, lines=0, crc=0, stats={}, totals={})
+
+def _newest_first(t):
+    """Sort key that orders transactions newest first."""
+    return -t.date.toordinal()
+
+def _parse_date(date_str):
+    """Parses a YYYY-MM-DD date by slicing it, which is far cheaper than strptime."""
+    if len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-':
+        return datetime.strptime(date_str, "%Y-%m-%d").date()  # Not zero-padded (2026-1-05), or invalid
+    return date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+def _is_append(mm):
+    """Checks whether the mapped file grew and still starts with exactly the bytes already parsed into the cache."""
+    offset = _CACHE["offset"]
+    if len(mm) <= offset:
+        return False
+    with memoryview(mm) as view:
+        return zlib.crc32(view[:offset]) == _CACHE["crc"]
+
+def _parse_lines(chunk):
+    """Parses a block of transaction lines.
+
+    Returns the transactions, their table rows, a (line number, line, error) entry per malformed line
+    and the number of lines, with line numbers counted from the start of the block.
+    """
+    transactions, rows, malformed = [], [], []
+    lines = chunk.decode("utf-8").splitlines()
+    reader = csv.reader(lines)  # Handles descriptions quoted because they contain commas
+    for row in reader:
+        if "".join(row).strip():
+            try:
+                date_str, type, category, description, amount_cents = row
+                transaction = Tx(
+                    _parse_date(date_str),
+                    _STRING_POOL.setdefault(type, type),
+                    _STRING_POOL.setdefault(category, category),
+                    description,
+                    int(amount_cents)
+                )
+            except ValueError as e:
+                malformed.append((reader.line_num, lines[reader.line_num - 1].strip(), e))
+                continue
+            transactions.append(transaction)
+            rows.append(_format_row(transaction))
+    return transactions, rows, malformed, len(lines)
+
+def _parse_parallel(data):
+    """Splits the bytes at line boundaries into one chunk per CPU and parses the chunks in worker processes."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = len(data) // (os.cpu_count() or 1) + 1
+    chunks = []
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", start + chunk_size)
+        end = len(data) if end == -1 else end + 1
+        chunks.append(data[start:end])
+        start = end
+
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        results = list(executor.map(_parse_lines, chunks))
+
+    # Strings come back from each worker as separate objects; share them through this process's pool again
+    for transactions, _, _, _ in results:
+        transactions[:] = [
+            t._replace(type=_STRING_POOL.setdefault(t.type, t.type), category=_STRING_POOL.setdefault(t.category, t.category))
+            for t in transactions
+        ]
+    return results
+
+def _format_row(t):
+    """Formats a transaction as a list_transactions table row."""
+    color = _ROW_COLORS[t.type == 'expense']
+    return (
+        str(t.date),
+        f"[{color}]{t.type.capitalize()}[/{color}]",
+        t.category,
+        t.description,
+        f"[{color}]{t.amount / 100:.2f}[/{color}]"
+    )
+
+def _append_transaction(transaction):
+    """Appends a transaction to the file through the session's shared append handle."""
+    key = _file_key()
+    balance = _read_balance(key) if key is not None else (0, 0)
+
+    f = _append_handle()
+    if key is not None and key[1] > 0 and not _ends_with_newline():
+        f.write("\n")  # Otherwise the new row would be joined onto the file's unterminated last line
+    csv.writer(f, lineterminator="\n").writerow(transaction)  # Quotes a description containing commas
+    f.flush()  # Readers (the anomaly check, the dashboard) must see the line straight away
+
+    # Carry the stored totals forward by this one amount, if they matched the file before the write
+    if balance is not None:
+        total_income, total_expenses = balance
+        if transaction.type == 'income':
+            total_income += transaction.amount
+        elif transaction.type == 'expense':
+            total_expenses += transaction.amount
+        _write_balance(_file_key(), total_income, total_expenses)
+
+def _ends_with_newline():
+    """Checks whether the (non-empty) transactions file ends with a newline."""
+    with open(TRANSACTIONS_FILE, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _read_balance(key):
+    """Returns the (income, expenses) totals stored for this version of the file, or None if missing or stale."""
     try:
-        with open(TRANSACTIONS_FILE, "r") as f:
-            for line_num, line in enumerate(f, 1):
-                if line.strip():
-                    try:
-                        date_str, type, category, description, amount_cents = line.strip().split(',')
-                        transactions.append({
-                            "date": datetime.strptime(date_str, "%Y-%m-%d").date(),
-                            "type": type,
-                            "category": category,
-                            "description": description,
-                            "amount": int(amount_cents)
-                        })
-                    except ValueError as e:
-                        console.print(
-                            f"[bold yellow]Warning: Skipping malformed transaction on line {line_num} "
-                            f"in {TRANSACTIONS_FILE}: {line.strip()} ({e})[/bold yellow]"
-                        )
+        with open(BALANCE_FILE, "rb") as f:
+            mtime_ns, size, total_income, total_expenses = _BALANCE.unpack(f.read())
+    except (FileNotFoundError, struct.error):
+        return None
+    return (total_income, total_expenses) if (mtime_ns, size) == key else None
+
+def _write_balance(key, total_income, total_expenses):
+    """Stores the totals for this version of the transactions file."""
+    try:
+        with open(BALANCE_FILE, "wb") as f:
+            f.write(_BALANCE.pack(*key, total_income, total_expenses))
+    except OSError:
+        pass  # The sidecar is only an optimization; the balance is recomputed without it
+
+def _append_handle():
+    """Returns the open append handle, reopening it if the file was removed or replaced since."""
+    f = _APPEND["file"]
+    try:
+        current = os.stat(TRANSACTIONS_FILE)
     except FileNotFoundError:
-        pass  # File might not exist yet, return empty list
-    return sorted(transactions, key=lambda t: t['date'], reverse=True)
+        current = None
+    if f is None or current is None or not os.path.samestat(os.fstat(f.fileno()), current):
+        if f is not None:
+            f.close()
+        f = _APPEND["file"] = open(TRANSACTIONS_FILE, "a")
+    return f
+
+@atexit.register
+def _close_append_handle():
+    """Closes the append handle when the program exits."""
+    if _APPEND["file"] is not None:
+        _APPEND["file"].close()
 
 # --- Core Functions ---
 
@@ -64,23 +299,15 @@ def add_expense():
         date_str = questionary.text(
             "Enter date (YYYY-MM-DD, press Enter for today):"
         ).ask()
-        date = datetime.strptime(date_str, "%Y-%m-%d").date() if date_str else datetime.now().date()
+        date = _parse_date(date_str) if date_str else datetime.now().date()
 
-        with open(TRANSACTIONS_FILE, "a") as f:
-            f.write(f"{date},{'expense'},{category},{description},{amount}\n")
+        _append_transaction(Tx(date, "expense", category, description, amount))
 
         console.print("\n[bold green]Expense added successfully![/bold green]")
         
-        # Check for unusual spending
-        all_transactions = _read_transactions()
-        new_transaction = {
-            "date": date,
-            "type": "expense",
-            "category": category,
-            "description": description,
-            "amount": amount
-        }
-        if detect_unusual_spending(all_transactions, new_transaction):
+        # Check for unusual spending against the category's running stats, which now include this expense
+        _read_transactions()
+        if detect_unusual_spending(_CACHE["stats"].get(category, (0, 0)), amount):
             console.print(
                 f"[bold yellow]Warning: This spending is unusually high for the '{category}' category.[/bold yellow]"
             )
@@ -111,10 +338,9 @@ def add_income():
         date_str = questionary.text(
             "Enter date (YYYY-MM-DD, press Enter for today):"
         ).ask()
-        date = datetime.strptime(date_str, "%Y-%m-%d").date() if date_str else datetime.now().date()
+        date = _parse_date(date_str) if date_str else datetime.now().date()
 
-        with open(TRANSACTIONS_FILE, "a") as f:
-            f.write(f"{date},{'income'},{source},{description},{amount}\n")
+        _append_transaction(Tx(date, "income", source, description, amount))
 
         console.print("\n[bold green]Income added successfully![/bold green]")
 
@@ -139,17 +365,8 @@ def list_transactions():
     table.add_column("Description", width=40)
     table.add_column("Amount", justify="right")
 
-    for t in transactions:
-        amount_str = f"{t['amount'] / 100:.2f}"
-        color = "red" if t['type'] == 'expense' else "green"
-        
-        table.add_row(
-            str(t['date']),
-            f"[{color}]{t['type'].capitalize()}[/{color}]",
-            t['category'],
-            t['description'],
-            f"[{color}]{amount_str}[/{color}]"
-        )
+    for row in _CACHE["rows"]:
+        table.add_row(*row)
     
     console.print(table)
 
@@ -157,10 +374,19 @@ def list_transactions():
 def show_balance():
     """Calculates and displays the current financial balance."""
     console.print("\n[bold cyan]-- Current Balance --[/bold cyan]")
-    transactions = _read_transactions()
+    key = _file_key()
+    balance = _read_balance(key) if key is not None else (0, 0)
 
-    total_income = sum(t['amount'] for t in transactions if t['type'] == 'income')
-    total_expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
+    if balance is None:
+        # No current sidecar; per-type totals are accumulated in the same pass that parses the lines.
+        # The file is parsed from the start and the sidecar only stored if the file didn't change meanwhile,
+        # since totals carried over from an earlier cache would otherwise be stamped as current.
+        _reset_cache()
+        _read_transactions()
+        balance = (_CACHE["totals"].get('income', 0), _CACHE["totals"].get('expense', 0))
+        if _CACHE["key"] == key == _file_key():
+            _write_balance(key, *balance)
+    total_income, total_expenses = balance
     balance = total_income - total_expenses
 
     # Format for display
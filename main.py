@@ -1,19 +1,19 @@
+import importlib
 import questionary
 from rich.console import Console
 from rich.panel import Panel
 import os
-# Import features
-from features.transactions import transactions
-from features.budgets import budgets
-from features.analytics import analytics
-from features.smart_assistant import smart_assistant
-from features.data_management import data_management
+# Feature modules are imported on first use of their menu entry, so the menu appears sooner
 
 # Initialize Rich Console
 console = Console()
 
 def show_smart_assistant():
     """Shows recommendations from the Smart Financial Assistant."""
+    from features.transactions import transactions
+    from features.budgets import budgets
+    from features.smart_assistant import smart_assistant
+
     console.print("\n[bold cyan]-- Smart Financial Assistant --[/bold cyan]")
     
     all_transactions = transactions._read_transactions()
@@ -36,65 +36,63 @@ def show_smart_assistant():
     console.print(panel)
 
 
+# --- Menu ---
+def _lazy(module_name, function_name):
+    """Returns a menu action that imports its feature module the first time it runs."""
+    def action():
+        getattr(importlib.import_module(module_name), function_name)()
+    return action
+
+_MENU_CHOICES = [
+    "Add Expense",
+    "Add Income",
+    "List Transactions",
+    "Show Balance",
+    "Set Budget",
+    "View Budgets",
+    "--- Analytics ---",
+    "Spending Analysis",
+    "Income Analysis",
+    "Savings Analysis",
+    "Financial Health Score",
+    "Financial Summary & Recommendations",
+    "Generate Monthly Report",
+    "--- Smart Assistant ---",
+    "Smart Financial Assistant",
+    "--- Data Management ---",
+    "Data Management",
+    "---",
+    "Exit"
+]
+
+_DISPATCH = {
+    "Add Expense": _lazy("features.transactions.transactions", "add_expense"),
+    "Add Income": _lazy("features.transactions.transactions", "add_income"),
+    "List Transactions": _lazy("features.transactions.transactions", "list_transactions"),
+    "Show Balance": _lazy("features.transactions.transactions", "show_balance"),
+    "Set Budget": _lazy("features.budgets.budgets", "set_budget"),
+    "View Budgets": _lazy("features.budgets.budgets", "view_budget"),
+    "Spending Analysis": _lazy("features.analytics.analytics", "analyze_spending"),
+    "Income Analysis": _lazy("features.analytics.analytics", "analyze_income"),
+    "Savings Analysis": _lazy("features.analytics.analytics", "analyze_savings"),
+    "Financial Health Score": _lazy("features.analytics.analytics", "financial_health_score"),
+    "Financial Summary & Recommendations": _lazy("features.analytics.analytics", "show_financial_summary_and_recommendations"),
+    "Generate Monthly Report": _lazy("features.analytics.analytics", "generate_monthly_report"),
+    "Smart Financial Assistant": show_smart_assistant,
+    "Data Management": _lazy("features.data_management.data_management", "main"),
+}
+
 def main():
     """Main function to run the finance tracker CLI."""
     console.print("\n[bold magenta]Welcome to your Personal Finance Tracker![/bold magenta]")
     console.print("What would you like to do today?")
 
     while True:
-        choice = questionary.select(
-            "Main Menu:",
-            choices=[
-                "Add Expense",
-                "Add Income",
-                "List Transactions",
-                "Show Balance",
-                "Set Budget",
-                "View Budgets",
-                "--- Analytics ---",
-                "Spending Analysis",
-                "Income Analysis",
-                "Savings Analysis",
-                "Financial Health Score",
-                "Financial Summary & Recommendations",
-                "Generate Monthly Report",
-                "--- Smart Assistant ---",
-                "Smart Financial Assistant",
-                "--- Data Management ---",
-                "Data Management",
-                "---",
-                "Exit"
-            ]
-        ).ask()
+        choice = questionary.select("Main Menu:", choices=_MENU_CHOICES).ask()
 
-        if choice == "Add Expense":
-            transactions.add_expense()
-        elif choice == "Add Income":
-            transactions.add_income()
-        elif choice == "List Transactions":
-            transactions.list_transactions()
-        elif choice == "Show Balance":
-            transactions.show_balance()
-        elif choice == "Set Budget":
-            budgets.set_budget()
-        elif choice == "View Budgets":
-            budgets.view_budget()
-        elif choice == "Spending Analysis":
-            analytics.analyze_spending()
-        elif choice == "Income Analysis":
-            analytics.analyze_income()
-        elif choice == "Savings Analysis":
-            analytics.analyze_savings()
-        elif choice == "Financial Health Score":
-            analytics.financial_health_score()
-        elif choice == "Financial Summary & Recommendations":
-            analytics.show_financial_summary_and_recommendations()
-        elif choice == "Generate Monthly Report":
-            analytics.generate_monthly_report()
-        elif choice == "Smart Financial Assistant":
-            show_smart_assistant()
-        elif choice == "Data Management":
-            data_management.main()
+        action = _DISPATCH.get(choice)
+        if action:
+            action()
         elif choice == "Exit" or choice is None:
             console.print("\n[bold]Goodbye![/bold]\n")
             break